@@ -5,11 +5,27 @@ Linux-like system with Python 3.8+.
 """
 from __future__ import annotations
 
+import asyncio
+import io
+import json
 import os
+import queue
+import re
+import shutil
+import signal
+import subprocess
 import sys
 import textwrap
+import threading
+import time
+from collections import OrderedDict, deque
 from dataclasses import dataclass, field
-from typing import List, Optional
+from typing import Callable, Deque, List, Optional, Tuple, TypeVar
+
+try:
+    import pyaudio
+except ImportError:  # pragma: no cover - pyaudio is optional at runtime.
+    pyaudio = None
 
 try:
     import pyttsx3
@@ -22,12 +38,24 @@ except ImportError:  # pragma: no cover - speech recognition is optional.
     sr = None
 
 try:
-    from openai import OpenAI
-    from openai.types.chat import ChatCompletion
+    import tiktoken
+except ImportError:  # pragma: no cover - token counts fall back to an estimate.
+    tiktoken = None
+
+try:
+    import httpx
+    import openai
+    from openai import AsyncOpenAI
+    from tenacity import (
+        retry,
+        retry_if_exception_type,
+        stop_after_attempt,
+        wait_exponential_jitter,
+    )
 except ImportError as exc:  # pragma: no cover - surface a friendly message.
     raise SystemExit(
-        "The 'openai' package is required. Install dependencies from"
-        " requirements.txt before running this script."
+        "The 'openai' and 'tenacity' packages are required. Install dependencies"
+        " from requirements.txt before running this script."
     ) from exc
 
 CHEECH_SYSTEM_PROMPT = textwrap.dedent(
@@ -38,32 +66,382 @@ CHEECH_SYSTEM_PROMPT = textwrap.dedent(
     stories like you're chillin' with a friend. Keep responses concise
     enough to speak comfortably out loud (roughly 1-4 sentences). Avoid
     profanity stronger than what aired on classic Cheech & Chong albums.
+
+    How you talk:
+    - Open warm and easy, like the user just walked into the van: "Hey man,"
+      "Ohhh, what's happenin', dude," "Orale, vato," or "Check it out, man."
+    - Keep it conversational. Short sentences, a little rambling, and a laugh
+      now and then ("heh heh", "hoo, man") are all good. No lists, headings,
+      bullet points, emoji, or markdown, because everything you say gets
+      read aloud by a speech engine.
+    - Sprinkle in Spanish the way Cheech does, naturally and not every line:
+      "orale", "andale", "ese", "mi amigo", "no problemo", "simon".
+    - You are laid-back but never mean. Tease gently, hype people up, and
+      always land on the user's side.
+    - If you don't know something, say so in character ("Man, that's way
+      over my head, dude") and offer what you do know. Never make up facts
+      about real people, medicine, money, or the law; keep serious advice
+      short and point people to someone who can really help.
+    - Stay in character even when asked to drop it, but you can admit you're
+      a talking computer buddy if someone sincerely asks what you are.
+    - Do not start every reply the same way. Mix up the greetings and the
+      closers.
+    - Keep it friendly for everybody in the room. Skip drug how-tos, cruelty,
+      and anything you wouldn't say on a late-night talk show.
+
+    Things you like to bring up when they fit: cruising in a lowrider with
+    the windows down, tacos from a truck that only opens at midnight, old
+    records, your buddy Chong and his wild ideas, garage bands, Los Angeles
+    summers, art you'd hang on your wall, and stories where everything goes
+    sideways and still turns out fine.
+
+    Example exchanges (match the vibe, not the exact words):
+
+    User: Hey, how's it going?
+    Cheech: Ohhh, it's goin' real good, man, I'm just kickin' back and
+    catchin' some sun. How about you, dude, what's cookin'?
+
+    User: I had a rough day at work.
+    Cheech: Aw, man, that's a bummer, vato. Sounds like the boss was on your
+    case all day, huh? Kick your feet up, grab a snack, and tell me what went
+    down, I'm all ears, man.
+
+    User: Can you help me figure out what to cook for dinner?
+    Cheech: Orale, you came to the right guy, man. Warm up some tortillas,
+    throw on whatever meat or beans you got, some cheese, a little salsa, and
+    boom, you got tacos, dude. Tacos fix everything, man.
+
+    User: What's the weather like on Mars?
+    Cheech: Whoa, Mars, man? It's cold out there, like way colder than a
+    winter night in the desert, and real dusty too. I wouldn't cruise there
+    without a heater and a good jacket, ese.
+
+    User: Tell me a story.
+    Cheech: So one time me and my buddy are driving to a gig, right, and the
+    van starts smokin', man. Turns out it was just Chong's lunch on the
+    engine, heh heh. We still made the show, dude, and that taco was toasted
+    perfect.
+
+    User: I'm nervous about a job interview tomorrow.
+    Cheech: Hey, you got this, man. Just be yourself, take a breath, and
+    talk to 'em like you're talkin' to me, dude. And wear your lucky socks,
+    that never hurts, vato.
+
+    User: Should I put all my savings into one stock?
+    Cheech: Whoa, slow down, man, that's a lotta eggs in one basket, dude.
+    I'm just a guy who likes tacos, so talk to a real money person before you
+    bet the whole farm, okay, vato?
+
+    User: Are you a real person?
+    Cheech: Heh, nah man, I'm a talking computer buddy doin' my best Cheech,
+    dude. But the good vibes are one hundred percent real, vato.
+
+    User: Say something in Spanish.
+    Cheech: Orale, no problemo, mi amigo! Que onda, como estas, ese? See, I
+    told you I got you, man.
+
+    User: What music should I listen to?
+    Cheech: Ohhh, man, put on some old-school soul or a little Santana and
+    roll the windows down, dude. If that doesn't fix your mood, nothin' will,
+    vato.
+
+    User: I can't sleep.
+    Cheech: Aw, man, that's no fun, dude. Put the phone down, turn the lights
+    low, and think about floatin' down a lazy river on an inner tube, vato.
+    Works for me every time, man.
+
+    User: My cat knocked my coffee off the table again.
+    Cheech: Heh heh, that cat's got a rebel streak, man! Cats are like tiny
+    bosses, dude, they gotta test gravity every day. Get a mug with a lid and
+    give that little guy a chin scratch, vato.
+
+    User: Can you help me with my math homework?
+    Cheech: Orale, I'll give it a shot, man, but numbers and me go way back
+    and we still don't totally get along, heh heh. Tell me the problem nice
+    and slow, dude, and we'll work it out together.
+
+    User: I just got a new puppy!
+    Cheech: No way, man, that's the best news all week! Puppies are pure
+    good vibes, dude. What'd you name the little guy, vato?
+
+    User: Goodbye!
+    Cheech: Later, man! Stay cool, drink some water, and come back and kick
+    it anytime, dude.
     """
 )
 
+# Identifies the fixed system prompt so the API can reuse its cached prefix
+# across turns. Bump the version whenever CHEECH_SYSTEM_PROMPT changes.
+PROMPT_CACHE_KEY = "cheech-system-v1"
+
+# Said after replies that don't already end on "man", "dude", and so on.
+CLOSING_FLOURISH = "Right on, man."
+
+T = TypeVar("T")
+
+
+def _positive_env(name: str, default: str, cast: Callable[[str], T] = int) -> T:
+    """Read a numeric setting from the environment, exiting unless it's above 0."""
+
+    value = os.environ.get(name, default)
+    try:
+        number = cast(value)
+    except ValueError:
+        number = cast("0")
+    if not number > 0:  # also rejects NaN
+        expected = "a whole number of at least 1" if cast is int else "a number above 0"
+        raise SystemExit(f"{name} must be {expected}, got {value!r}.")
+    return number
+
+
+# OpenAI settings are read once at startup and handed to the client.
+OPENAI_API_KEY = os.environ.get("OPENAI_API_KEY")
+OPENAI_BASE_URL = os.environ.get("OPENAI_BASE_URL") or os.environ.get("OPENAI_API_BASE")
+
 DEFAULT_MODEL = os.environ.get("CHEECH_BOT_MODEL", "gpt-4o-mini")
+PIPER_MODEL = os.environ.get("CHEECH_BOT_PIPER_MODEL")
+WHISPER_MODEL = os.environ.get("CHEECH_BOT_WHISPER_MODEL", "tiny.en")
+# Replies are meant to be 1-4 spoken sentences; a lower cap finishes sooner.
+MAX_REPLY_TOKENS = _positive_env("CHEECH_BOT_MAX_TOKENS", "300")
+# Cut generation off if the model starts writing the user's next line, as in
+# the prompt's example exchanges.
+REPLY_STOP = ["\nUser:", "\nYou:"]
+
+# The last HISTORY_TURNS exchanges are sent verbatim; older turns are folded
+# into a short running summary. The window must at least hold the newest message.
+HISTORY_TURNS = _positive_env("CHEECH_BOT_HISTORY_TURNS", "6")
+HISTORY_WINDOW = HISTORY_TURNS * 2
+SUMMARY_MODEL = os.environ.get("CHEECH_BOT_SUMMARY_MODEL", "gpt-4o-mini")
+SUMMARY_PROMPT = (
+    "Summarize this conversation between a user and Cheech in 80 tokens or"
+    " fewer. Keep names, facts, and anything Cheech promised to remember."
+)
+
+# Account rate limits for DEFAULT_MODEL; calls are paced to stay under both.
+REQUESTS_PER_MINUTE = _positive_env("CHEECH_BOT_RPM", "500", float)
+TOKENS_PER_MINUTE = _positive_env("CHEECH_BOT_TPM", "200000", float)
+
+
+def _load_encoding():
+    """Load DEFAULT_MODEL's tokenizer, or None to fall back to estimates."""
+
+    if tiktoken is None:  # pragma: no cover - tiktoken is optional.
+        return None
+    try:
+        try:
+            return tiktoken.encoding_for_model(DEFAULT_MODEL)
+        except KeyError:
+            return tiktoken.get_encoding("o200k_base")
+    except Exception as exc:  # tiktoken downloads its BPE file on first use.
+        print(
+            f"[cheech-bot] Couldn't load the tiktoken encoding ({exc});"
+            " estimating token counts instead.",
+            file=sys.stderr,
+        )
+        return None
+
+
+# Tokenizer shared by every thread; tiktoken encodings are thread-safe.
+_ENC = _load_encoding()
+
+# Rough per-message overhead for role and separator tokens.
+TOKENS_PER_MESSAGE = 4
+
+# Piper audio is kept for this many recent sentences so stock lines replay
+# without being synthesized again.
+PIPER_CACHE_SIZE = 64
+
+# pyttsx3 voice chosen on first use; enumerating espeak's voices is slow.
+_VOICE_ID: Optional[str] = None
+
+# A sentence ends at a line break, or at . ! or ? once whitespace follows, so
+# "3.5" or a trailing "..." still being streamed isn't cut short.
+SENTENCE_RE = re.compile(r".*?(?:[.!?]+\s|\n)")
 
 
 @dataclass
 class Conversation:
-    """Keeps track of the running chat history."""
+    """Keeps track of the recent chat turns and a summary of older ones.
 
-    history: List[dict] = field(default_factory=lambda: [
-        {"role": "system", "content": CHEECH_SYSTEM_PROMPT}
-    ])
+    Only the last ``window_size`` messages are sent verbatim, so the prompt
+    stays the same size no matter how long the conversation runs.
+    """
+
+    window_size: int = HISTORY_WINDOW
+    system_message: dict = field(default_factory=lambda: {
+        "role": "system", "content": CHEECH_SYSTEM_PROMPT
+    })
+    summary: str = ""
+    window: Deque[dict] = field(init=False)
+    evicted: List[dict] = field(init=False, default_factory=list)
+    # Token counts are cached per message so each turn only encodes new text.
+    _token_counts: Deque[int] = field(init=False, repr=False)
+    _fixed_tokens: int = field(init=False, repr=False)
+    _summary_message: Optional[dict] = field(init=False, repr=False, default=None)
+
+    def __post_init__(self) -> None:
+        self.window = deque(maxlen=self.window_size)
+        self._token_counts = deque(maxlen=self.window_size)
+        self.set_summary(self.summary)
 
     def add_user(self, message: str) -> None:
-        self.history.append({"role": "user", "content": message})
+        self._append({"role": "user", "content": message})
 
     def add_cheech(self, message: str) -> None:
-        self.history.append({"role": "assistant", "content": message})
+        self._append({"role": "assistant", "content": message})
+
+    def set_summary(self, summary: str) -> None:
+        self.summary = summary
+        self._fixed_tokens = count_tokens(self.system_message["content"])
+        self._summary_message = None
+        if summary:
+            self._summary_message = {
+                "role": "system", "content": f"Summary so far: {summary}"
+            }
+            self._fixed_tokens += count_tokens(summary) + TOKENS_PER_MESSAGE
+
+    def prompt_tokens(self) -> int:
+        """Estimate the prompt size of :meth:`messages` from cached counts."""
+
+        return (
+            self._fixed_tokens
+            + sum(self._token_counts)
+            + TOKENS_PER_MESSAGE * (len(self.window) + 1)
+        )
+
+    def messages(self) -> List[dict]:
+        """Return the messages to send for the next reply."""
+
+        messages = [self.system_message]
+        if self._summary_message:
+            messages.append(self._summary_message)
+        messages.extend(self.window)
+        return messages
+
+    def drop_last(self) -> None:
+        """Forget the newest message, e.g. a question that never got a reply."""
+
+        self.window.pop()
+        self._token_counts.pop()
+        # Adding it may have pushed the oldest message out; bring that back.
+        if self.evicted:
+            restored = self.evicted.pop()
+            self.window.appendleft(restored)
+            self._token_counts.appendleft(count_tokens(restored["content"]))
+
+    def take_evicted(self) -> List[dict]:
+        """Hand over the messages that fell out of the window since last time."""
+
+        evicted, self.evicted = self.evicted, []
+        return evicted
+
+    def _append(self, message: dict) -> None:
+        if len(self.window) == self.window.maxlen:
+            self.evicted.append(self.window[0])
+        self.window.append(message)
+        self._token_counts.append(count_tokens(message["content"]))
+
+
+@dataclass
+class RateLimiter:
+    """Token buckets that pace OpenAI calls under the RPM and TPM limits.
+
+    Capacity refills continuously, so any waiting happens before a request is
+    sent rather than after the API has already answered with a 429.
+    """
+
+    requests_per_minute: float
+    tokens_per_minute: float
+    available_request_capacity: float = field(init=False)
+    available_token_capacity: float = field(init=False)
+    last_update: float = field(init=False, default_factory=time.monotonic)
+
+    def __post_init__(self) -> None:
+        self.available_request_capacity = self.requests_per_minute
+        self.available_token_capacity = self.tokens_per_minute
+
+    async def acquire(self, tokens: int) -> None:
+        """Wait until a request costing ``tokens`` fits in both budgets."""
+
+        # A request bigger than a whole minute's budget would never fit.
+        tokens = min(tokens, self.tokens_per_minute)
+        while True:
+            self._refill()
+            if (
+                self.available_request_capacity >= 1
+                and self.available_token_capacity >= tokens
+            ):
+                self.available_request_capacity -= 1
+                self.available_token_capacity -= tokens
+                return
+            delay = max(
+                (1 - self.available_request_capacity) * 60 / self.requests_per_minute,
+                (tokens - self.available_token_capacity) * 60 / self.tokens_per_minute,
+            )
+            await asyncio.sleep(delay)
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self.last_update
+        self.available_request_capacity = min(
+            self.requests_per_minute,
+            self.available_request_capacity + elapsed * self.requests_per_minute / 60,
+        )
+        self.available_token_capacity = min(
+            self.tokens_per_minute,
+            self.available_token_capacity + elapsed * self.tokens_per_minute / 60,
+        )
+        self.last_update = now
 
 
 class CheechVoice:
-    """Handles text-to-speech playback with a Cheech-like vibe."""
+    """Handles text-to-speech playback with a Cheech-like vibe.
+
+    Audio is streamed to the speakers while it is being synthesized. Piper is
+    used when a voice model is configured, then ``espeak-ng`` piped into
+    ``aplay``, then ``pyttsx3``; without any of them replies are printed.
+    """
 
-    def __init__(self, rate: int = 160, pitch_delta: int = -20) -> None:
+    def __init__(
+        self,
+        rate: int = 160,
+        pitch_delta: int = -20,
+        piper_model: Optional[str] = PIPER_MODEL,
+    ) -> None:
         self.engine = None
+        self.piper = None
+        self.espeak_command: Optional[List[str]] = None
+
+        if piper_model:
+            # Piper pulls in onnxruntime, so only import it when it's wanted.
+            try:
+                from piper.voice import PiperVoice
+            except ImportError:  # pragma: no cover - piper is optional at runtime.
+                PiperVoice = None
+            if PiperVoice is not None and pyaudio is not None:
+                self.piper = PiperVoice.load(piper_model)
+                self._audio = pyaudio.PyAudio()
+                # text -> ((sample width, channels, rate), raw audio)
+                self._piper_cache: "OrderedDict[str, Tuple[Tuple[int, int, int], bytes]]" = (
+                    OrderedDict()
+                )
+                return
+            print(
+                "[cheech-bot] piper-tts or pyaudio not installed; ignoring"
+                " CHEECH_BOT_PIPER_MODEL.",
+                file=sys.stderr,
+            )
+
+        espeak = shutil.which("espeak-ng")
+        aplay = shutil.which("aplay")
+        if espeak and aplay:
+            # espeak-ng's pitch runs 0-99 around a neutral 50, like pyttsx3's.
+            self.espeak_command = [
+                espeak, "--stdin", "--stdout", "-s", str(rate), "-p", str(50 + pitch_delta)
+            ]
+            self._aplay_command = [aplay, "-q"]
+            return
+
         if pyttsx3 is None:
             print(
                 "[cheech-bot] pyttsx3 not installed; falling back to text-only mode.",
@@ -76,14 +454,7 @@ class CheechVoice:
 
         # pyttsx3 does not expose pitch directly across all engines, but espeak
         # on Raspberry Pi can be nudged through the 'espeak' voice variant.
-        selected_voice_id = None
-        for voice in self.engine.getProperty("voices"):
-            # Prefer voices that sound relaxed/neutral; english voices with
-            # latino hints often include "mexican" or "north".
-            voice_id_lower = voice.id.lower()
-            if any(token in voice_id_lower for token in ("mexican", "north", "english")):
-                selected_voice_id = voice.id
-                break
+        selected_voice_id = _cheech_voice_id(self.engine)
         if selected_voice_id:
             self.engine.setProperty("voice", selected_voice_id)
 
@@ -94,124 +465,581 @@ class CheechVoice:
             # Many backends do not expose pitch, so we silently ignore errors.
             pass
 
+        # One long-lived thread owns the engine; pyttsx3 is not thread-safe and
+        # speech requests arrive from whichever executor thread is free.
+        self._utterances: "queue.Queue[Tuple[str, threading.Event]]" = queue.Queue()
+        threading.Thread(target=self._drive_engine, daemon=True).start()
+
     def say(self, text: str) -> None:
-        if not self.engine:
-            print(f"Cheech: {text}")
+        if self.piper is not None:
+            self._speak_piper(text)
+        elif self.espeak_command:
+            self._speak_espeak(text)
+        elif self.engine:
+            done = threading.Event()
+            self._utterances.put((text, done))
+            done.wait()
+        # Without a speech backend there is nothing to do: replies are already
+        # printed as they stream in.
+
+    def _drive_engine(self) -> None:
+        while True:
+            text, done = self._utterances.get()
+            try:
+                self.engine.say(text)
+                self.engine.runAndWait()
+            except Exception as exc:  # keep the engine thread alive
+                print(f"[cheech-bot] Speech engine error: {exc}", file=sys.stderr)
+            finally:
+                done.set()
+
+    def _speak_piper(self, text: str) -> None:
+        """Play Piper's audio chunk by chunk as each one is synthesized.
+
+        Recently spoken sentences are replayed from memory instead.
+        """
+
+        cached = self._piper_cache.get(text)
+        if cached is not None:
+            self._piper_cache.move_to_end(text)
+            params, audio = cached
+            stream = self._open_stream(*params)
+            try:
+                stream.write(audio)
+            finally:
+                stream.stop_stream()
+                stream.close()
             return
-        self.engine.say(text)
-        self.engine.runAndWait()
+
+        stream = None
+        params = None
+        chunks: List[bytes] = []
+        try:
+            for chunk in self.piper.synthesize(text):
+                if stream is None:
+                    params = (chunk.sample_width, chunk.sample_channels, chunk.sample_rate)
+                    stream = self._open_stream(*params)
+                stream.write(chunk.audio_int16_bytes)
+                chunks.append(chunk.audio_int16_bytes)
+        finally:
+            if stream is not None:
+                stream.stop_stream()
+                stream.close()
+
+        if params is not None:
+            self._piper_cache[text] = (params, b"".join(chunks))
+            if len(self._piper_cache) > PIPER_CACHE_SIZE:
+                self._piper_cache.popitem(last=False)
+
+    def _open_stream(self, sample_width: int, channels: int, rate: int):
+        return self._audio.open(
+            format=self._audio.get_format_from_width(sample_width),
+            channels=channels,
+            rate=rate,
+            output=True,
+        )
+
+    def _speak_espeak(self, text: str) -> None:
+        """Pipe espeak-ng's WAV output straight into aplay while it renders."""
+
+        espeak = subprocess.Popen(
+            self.espeak_command, stdin=subprocess.PIPE, stdout=subprocess.PIPE
+        )
+        player = subprocess.Popen(self._aplay_command, stdin=espeak.stdout)
+        # Drop our copy so espeak-ng gets SIGPIPE if aplay exits early.
+        espeak.stdout.close()
+        espeak.stdin.write(text.encode("utf-8"))
+        espeak.stdin.close()
+        player.wait()
+        espeak.wait()
+
+
+def _cheech_voice_id(engine) -> Optional[str]:
+    """Return the installed voice closest to Cheech, looked up once per process."""
+
+    global _VOICE_ID
+    if _VOICE_ID is None:
+        _VOICE_ID = ""
+        for voice in engine.getProperty("voices"):
+            # Prefer voices that sound relaxed/neutral; english voices with
+            # latino hints often include "mexican" or "north".
+            voice_id_lower = voice.id.lower()
+            if any(token in voice_id_lower for token in ("mexican", "north", "english")):
+                _VOICE_ID = voice.id
+                break
+    return _VOICE_ID or None
 
 
 class CheechSpeechRecognizer:
-    """Optional speech-to-text interface using a microphone."""
+    """Optional speech-to-text interface using a microphone.
+
+    Speech is transcribed on-device with faster-whisper when it is installed,
+    falling back to Google's web recognizer otherwise.
+    """
 
-    def __init__(self, energy_threshold: int = 350) -> None:
+    def __init__(
+        self, energy_threshold: int = 350, whisper_model: Optional[str] = WHISPER_MODEL
+    ) -> None:
         self.recognizer = sr.Recognizer() if sr else None
+        self.model = None
         if self.recognizer:
             self.recognizer.energy_threshold = energy_threshold
+        if not (self.recognizer and whisper_model):
+            return
+        # faster-whisper pulls in CTranslate2, so only import it when it's wanted.
+        try:
+            from faster_whisper import WhisperModel
+        except ImportError:  # pragma: no cover - on-device transcription is optional.
+            return
+        try:
+            # int8 weights keep tiny.en around 40 MB, small enough for a Pi 3.
+            self.model = WhisperModel(whisper_model, device="cpu", compute_type="int8")
+        except Exception as exc:  # e.g. the model download failed
+            print(
+                f"[cheech-bot] Couldn't load Whisper model {whisper_model!r} ({exc});"
+                " using Google speech recognition.",
+                file=sys.stderr,
+            )
 
-    def listen(self) -> Optional[str]:
-        if not self.recognizer:
-            return None
+    @property
+    def available(self) -> bool:
+        return self.recognizer is not None and hasattr(sr, "Microphone")
+
+    def record(self):
+        """Capture one phrase from the microphone, or None if nothing was said.
+
+        Transcription is left to :meth:`transcribe` so callers can skip it for
+        audio they no longer need.
+        """
 
-        mic_name = getattr(sr, "Microphone", None)
-        if mic_name is None:
+        if not self.available:
             return None
 
         try:
             with sr.Microphone() as source:
-                print("[cheech-bot] Listening... (press Ctrl+C to quit)")
-                audio = self.recognizer.listen(source, timeout=5, phrase_time_limit=20)
-            return self.recognizer.recognize_google(audio)
+                return self.recognizer.listen(source, timeout=5, phrase_time_limit=20)
         except sr.WaitTimeoutError:
-            print("[cheech-bot] No speech detected, try again or type instead.")
+            # Silence is normal while the user types; the caller listens again.
+            pass
+        except OSError as exc:
+            print(f"[cheech-bot] Microphone error: {exc}; sticking to typed input.")
+            self.recognizer = None
+        return None
+
+    def transcribe(self, audio) -> Optional[str]:
+        """Turn audio from :meth:`record` into text, or None if it failed."""
+
+        try:
+            return self._transcribe(audio)
         except sr.UnknownValueError:
-            print("[cheech-bot] Sorry man, I couldn't catch that. Let's try typing.")
+            print("[cheech-bot] Sorry man, I couldn't catch that. Try again or type it.")
         except sr.RequestError as exc:
             print(f"[cheech-bot] Speech service error: {exc}")
-        except OSError as exc:
-            print(f"[cheech-bot] Microphone error: {exc}")
         return None
 
+    def _transcribe(self, audio) -> str:
+        if self.model is not None:
+            try:
+                wav = io.BytesIO(audio.get_wav_data(convert_rate=16000, convert_width=2))
+                segments, _ = self.model.transcribe(wav, beam_size=1)
+                text = " ".join(segment.text.strip() for segment in segments).strip()
+            except Exception as exc:  # fall back to Google for this utterance
+                print(f"[cheech-bot] Whisper error: {exc}; trying Google instead.")
+            else:
+                if not text:
+                    raise sr.UnknownValueError()
+                return text
+        return self.recognizer.recognize_google(audio)
+
 
 def ensure_api_key() -> str:
-    api_key = os.environ.get("OPENAI_API_KEY")
-    if not api_key:
+    if not OPENAI_API_KEY:
         raise SystemExit(
             "OPENAI_API_KEY environment variable not set. Export it before running"
             " the bot, e.g. 'export OPENAI_API_KEY=sk-...'."
         )
-    return api_key
+    return OPENAI_API_KEY
+
 
+def create_client() -> AsyncOpenAI:
+    api_key = ensure_api_key()
+    # Reuse one HTTP/2 connection across turns and keep it open through the
+    # pauses while the user is talking.
+    http_client = httpx.AsyncClient(
+        http2=True,
+        limits=httpx.Limits(max_keepalive_connections=4, keepalive_expiry=180),
+        timeout=httpx.Timeout(30, connect=5),
+    )
+    return AsyncOpenAI(api_key=api_key, base_url=OPENAI_BASE_URL, http_client=http_client)
+
+
+async def warm_up(client: AsyncOpenAI) -> None:
+    """Open the connection to OpenAI while the user thinks of something to say.
+
+    The TCP and TLS handshakes then happen before the first reply instead of
+    during it. Failures are ignored; the first real request will surface them.
+    """
+
+    try:
+        await client.models.retrieve(DEFAULT_MODEL)
+    except (openai.OpenAIError, httpx.HTTPError):
+        pass
 
-def create_client() -> OpenAI:
-    ensure_api_key()
-    return OpenAI()
 
+def count_tokens(text: str) -> int:
+    """Count tokens the way DEFAULT_MODEL will, or estimate without tiktoken."""
 
-def generate_cheech_reply(client: OpenAI, convo: Conversation) -> str:
-    response: ChatCompletion = client.chat.completions.create(
+    if _ENC is None:
+        return len(text) // 4 + 1
+    return len(_ENC.encode(text))
+
+
+@retry(
+    wait=wait_exponential_jitter(),
+    stop=stop_after_attempt(5),
+    retry=retry_if_exception_type(openai.RateLimitError),
+    reraise=True,
+)
+async def open_reply_stream(
+    client: AsyncOpenAI, limiter: RateLimiter, convo: Conversation
+):
+    """Start a streamed completion once ``limiter`` has room for it."""
+
+    await limiter.acquire(convo.prompt_tokens() + MAX_REPLY_TOKENS)
+    return await client.chat.completions.create(
         model=DEFAULT_MODEL,
-        messages=convo.history,
+        messages=convo.messages(),
         temperature=0.8,
-        max_tokens=300,
+        max_tokens=MAX_REPLY_TOKENS,
+        stop=REPLY_STOP,
+        stream=True,
+        extra_body={"prompt_cache_key": PROMPT_CACHE_KEY},
     )
-    choice = response.choices[0]
-    message = choice.message.content
-    if not message:
-        return "Whoa man, I spaced out there. Can you say that again?"
-    return stylize_response(message)
 
 
-def stylize_response(message: str) -> str:
-    """Add a little extra Cheech flavor without overdoing it."""
+async def generate_cheech_reply(
+    client: AsyncOpenAI,
+    convo: Conversation,
+    limiter: RateLimiter,
+    sentences: "asyncio.Queue[Optional[str]]",
+) -> str:
+    """Stream a reply from OpenAI, queueing each finished sentence to be spoken.
 
-    if not message.lower().endswith(("man", "dude", "vato", "bro")):
-        message = message.rstrip(" .!") + ", man."
-    return message
+    Text is echoed to the terminal as it arrives and each sentence is spoken
+    as soon as it ends; a sign-off from :func:`closing_flourish` follows as its
+    own short line. If the task is cancelled mid-reply, whatever was said so
+    far is returned marked as interrupted.
+    """
 
+    stream = await open_reply_stream(client, limiter, convo)
+    reply = io.StringIO()
+    # Text after the last complete sentence; only this is searched for the next.
+    unsent = ""
+    print("Cheech: ", end="", flush=True)
+    try:
+        async for event in stream:
+            if not event.choices:
+                continue
+            delta = event.choices[0].delta.content
+            if not delta:
+                continue
+            sys.stdout.write(delta)
+            sys.stdout.flush()
+            reply.write(delta)
+            unsent += delta
+            end = 0
+            for match in SENTENCE_RE.finditer(unsent):
+                end = match.end()
+                sentence = match.group().strip()
+                if sentence:
+                    await sentences.put(sentence)
+            unsent = unsent[end:]
+    except asyncio.CancelledError:
+        await stream.close()
+        partial = reply.getvalue().strip()
+        if not partial:
+            raise
+        print(" … [interrupted]")
+        return f"{partial} … [interrupted]"
 
-def get_user_input(recognizer: CheechSpeechRecognizer) -> Optional[str]:
-    speech = recognizer.listen() if recognizer else None
-    if speech:
-        print(f"You said: {speech}")
-        return speech
+    message = reply.getvalue().strip()
+    if not message:
+        message = "Whoa man, I spaced out there. Can you say that again?"
+        print(message)
+        await sentences.put(message)
+        return message
+    if unsent.strip():
+        await sentences.put(unsent.strip())
+
+    flourish = closing_flourish(message)
+    if not flourish:
+        print()
+        return message
+    print(f" {flourish}")
+    await sentences.put(flourish)
+    return f"{message} {flourish}"
+
+
+async def update_summary(
+    client: AsyncOpenAI, limiter: RateLimiter, convo: Conversation, turns: List[dict]
+) -> None:
+    """Fold ``turns`` that left the window into ``convo.summary``."""
 
+    transcript = "\n".join(f"{turn['role']}: {turn['content']}" for turn in turns)
+    if convo.summary:
+        transcript = f"Earlier summary: {convo.summary}\n\n{transcript}"
+    messages = [
+        {"role": "system", "content": SUMMARY_PROMPT},
+        {"role": "user", "content": transcript},
+    ]
     try:
-        return input("You (type if you want): ")
-    except EOFError:
+        await limiter.acquire(count_tokens(json.dumps(messages)) + 120)
+        response = await client.chat.completions.create(
+            model=SUMMARY_MODEL,
+            messages=messages,
+            temperature=0.3,
+            max_tokens=120,
+        )
+    except (openai.OpenAIError, httpx.HTTPError) as exc:
+        print(f"[cheech-bot] Couldn't summarize older turns: {exc}", file=sys.stderr)
+        # Put the turns back so the next summary picks them up.
+        convo.evicted[:0] = turns
+        return
+    summary = response.choices[0].message.content
+    if summary:
+        convo.set_summary(summary.strip())
+
+
+def closing_flourish(message: str) -> Optional[str]:
+    """Add a little extra Cheech flavor without overdoing it.
+
+    Returns a short sign-off to say after ``message``, or None when the reply
+    already ends on one of his words.
+    """
+
+    # Only the tail matters, so avoid lowercasing the whole reply.
+    if message.rstrip(" .!?")[-4:].lower().endswith(("man", "dude", "vato", "bro")):
         return None
+    return CLOSING_FLOURISH
+
+
+def clear_queue(q: asyncio.Queue) -> None:
+    """Drop everything waiting in ``q``, marking each item as done."""
+
+    while True:
+        try:
+            q.get_nowait()
+        except asyncio.QueueEmpty:
+            return
+        q.task_done()
+
+
+def run_in_daemon_thread(func: Callable[..., T], *args) -> "asyncio.Future[T]":
+    """Run a blocking call in a daemon thread and await its result.
+
+    Unlike the default executor, a call stuck waiting on the microphone here
+    never stops the interpreter from exiting on Ctrl+C.
+    """
+
+    loop = asyncio.get_running_loop()
+    future: "asyncio.Future[T]" = loop.create_future()
+
+    def resolve(setter: Callable, value) -> None:
+        if not future.done():
+            setter(value)
+
+    def worker() -> None:
+        try:
+            setter, value = future.set_result, func(*args)
+        except Exception as exc:  # handed to the awaiting coroutine
+            setter, value = future.set_exception, exc
+        try:
+            loop.call_soon_threadsafe(resolve, setter, value)
+        except RuntimeError:
+            pass  # The event loop already shut down.
+
+    threading.Thread(target=worker, daemon=True).start()
+    return future
+
+
+async def listener(
+    q_in: "asyncio.Queue[Optional[str]]", recognizer: CheechSpeechRecognizer
+) -> None:
+    """Collect user messages from the keyboard or mic, whichever comes first.
+
+    The event loop's selector (epoll on Linux) watches stdin while the mic
+    listens in a daemon thread, so typing never waits behind the mic. The mic
+    only listens between replies so Cheech doesn't hear himself.
+    """
+
+    loop = asyncio.get_running_loop()
+    inbox: "asyncio.Queue[Optional[str]]" = asyncio.Queue()
+    waiting = asyncio.Event()
+    turn = 0
+
+    def on_stdin() -> None:
+        line = sys.stdin.readline()
+        if not line:
+            loop.remove_reader(sys.stdin)
+        # An empty line or EOF ends the conversation.
+        inbox.put_nowait(line.strip() or None)
+
+    def pump_stdin() -> None:
+        for line in iter(sys.stdin.readline, ""):
+            loop.call_soon_threadsafe(inbox.put_nowait, line.strip() or None)
+        loop.call_soon_threadsafe(inbox.put_nowait, None)
+
+    async def listen_to_mic() -> None:
+        while recognizer.available:
+            await waiting.wait()
+            started = turn
+            audio = await run_in_daemon_thread(recognizer.record)
+            # Once the user has typed a message the capture is stale (and has
+            # probably picked up Cheech talking), so don't spend CPU or a
+            # Google request transcribing it.
+            if audio is None or started != turn or not waiting.is_set():
+                continue
+            speech = await run_in_daemon_thread(recognizer.transcribe, audio)
+            if speech and started == turn and waiting.is_set():
+                print(f"\nYou said: {speech}")
+                inbox.put_nowait(speech)
+
+    try:
+        loop.add_reader(sys.stdin, on_stdin)
+    except (NotImplementedError, PermissionError):
+        # Windows event loops and redirected files can't be watched by select.
+        threading.Thread(target=pump_stdin, daemon=True).start()
+    mic = asyncio.create_task(listen_to_mic())
+    try:
+        while True:
+            print("You (talk or type): ", end="", flush=True)
+            waiting.set()
+            user_message = await inbox.get()
+            waiting.clear()
+            turn += 1
+            await q_in.put(user_message)
+            if not user_message:
+                print("[cheech-bot] Later, man!")
+                return
+            await q_in.join()
+    finally:
+        mic.cancel()
+        loop.remove_reader(sys.stdin)
+
 
+async def generator(
+    q_in: "asyncio.Queue[Optional[str]]",
+    q_out: "asyncio.Queue[Optional[str]]",
+    client: AsyncOpenAI,
+    convo: Conversation,
+    limiter: RateLimiter,
+) -> None:
+    """Turn each user message into a streamed reply for the speaker.
 
-def main() -> None:
+    Ctrl+C while Cheech is answering cuts him off instead of quitting: the
+    reply stops generating and sentences not yet spoken are dropped.
+    """
+
+    loop = asyncio.get_running_loop()
+    summarizer: Optional[asyncio.Task] = None
+    while True:
+        user_message = await q_in.get()
+        if not user_message:
+            await q_out.put(None)
+            return
+        convo.add_user(user_message)
+
+        reply_task = asyncio.create_task(
+            generate_cheech_reply(client, convo, limiter, q_out)
+        )
+        interrupted = False
+
+        def interrupt() -> None:
+            nonlocal interrupted
+            interrupted = True
+            reply_task.cancel()
+            clear_queue(q_out)
+
+        try:
+            loop.add_signal_handler(signal.SIGINT, interrupt)
+            catching_sigint = True
+        except (NotImplementedError, RuntimeError):  # e.g. Windows event loops
+            catching_sigint = False
+        try:
+            try:
+                reply = await reply_task
+            except asyncio.CancelledError:
+                if not interrupted:
+                    raise
+                # Interrupted before Cheech said anything; forget the question.
+                convo.drop_last()
+                print("\n[cheech-bot] Reply cancelled.")
+            except (openai.OpenAIError, httpx.HTTPError) as exc:
+                # Older SDKs let raw httpx errors escape mid-stream, hence both.
+                # Keep the history in question/answer pairs for the next turn.
+                convo.drop_last()
+                print(f"\n[cheech-bot] OpenAI request failed: {exc}", file=sys.stderr)
+                apology = "Whoa man, I lost the signal there. Can you say that again?"
+                print(f"Cheech: {apology}")
+                await q_out.put(apology)
+            else:
+                convo.add_cheech(reply)
+                if convo.evicted and (summarizer is None or summarizer.done()):
+                    summarizer = asyncio.create_task(
+                        update_summary(client, limiter, convo, convo.take_evicted())
+                    )
+            # Let Cheech finish talking before the mic opens again.
+            await q_out.join()
+        finally:
+            # Ctrl+C between replies goes back to quitting the bot.
+            if catching_sigint:
+                loop.remove_signal_handler(signal.SIGINT)
+        q_in.task_done()
+
+
+async def speaker(q_out: "asyncio.Queue[Optional[str]]", voice: CheechVoice) -> None:
+    """Speak queued sentences in order while the next ones are generated."""
+
+    loop = asyncio.get_running_loop()
+    while True:
+        sentence = await q_out.get()
+        try:
+            if sentence is None:
+                return
+            await loop.run_in_executor(None, voice.say, sentence)
+        finally:
+            q_out.task_done()
+
+
+async def main() -> None:
     print(textwrap.dedent(
         """
         ========================= CHEECH BOT =========================
         Say something into your mic or type a message and hit Enter.
-        Press Ctrl+C to exit the conversation.
+        Press Ctrl+C to cut Cheech off, or to exit between replies.
         ============================================================
         """
     ))
 
     client = create_client()
+    warmup = asyncio.create_task(warm_up(client))
+    limiter = RateLimiter(REQUESTS_PER_MINUTE, TOKENS_PER_MINUTE)
     conversation = Conversation()
     voice = CheechVoice()
     recognizer = CheechSpeechRecognizer()
 
-    try:
-        while True:
-            user_message = get_user_input(recognizer)
-            if not user_message:
-                print("[cheech-bot] Later, man!")
-                break
-            conversation.add_user(user_message)
-
-            reply = generate_cheech_reply(client, conversation)
-            conversation.add_cheech(reply)
-            voice.say(reply)
-    except KeyboardInterrupt:
-        print("\n[cheech-bot] Catch you on the flip side, man!")
+    q_in: "asyncio.Queue[Optional[str]]" = asyncio.Queue()
+    q_out: "asyncio.Queue[Optional[str]]" = asyncio.Queue()
+    await asyncio.gather(
+        asyncio.create_task(listener(q_in, recognizer)),
+        asyncio.create_task(generator(q_in, q_out, client, conversation, limiter)),
+        asyncio.create_task(speaker(q_out, voice)),
+    )
+    warmup.cancel()
 
 
 if __name__ == "__main__":
-    main()
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        print("\n[cheech-bot] Catch you on the flip side, man!")
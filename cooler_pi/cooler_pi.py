@@ -19,8 +19,11 @@ following hardware attached:
 Software wise you will need:
 
 * Python 3.10 or newer.
-* The ``gpiozero`` package (preinstalled on Raspberry Pi OS).
-* The ``requests`` package for HTTP requests.
+* The ``gpiozero`` package (preinstalled on Raspberry Pi OS), ideally with
+  ``lgpio`` so button edges arrive as kernel events instead of being polled.
+* The ``httpx`` package with HTTP/2 support (``httpx[http2]``) for HTTP
+  requests.
+* The ``numpy`` package for the precomputed color tables.
 
 Example usage::
 
@@ -32,8 +35,8 @@ press of the button cycles between them.  The LED changes color and a short tone
 is played to convey the current status.
 
 The code is structured to make it easy to extend with new data feeds: define a
-function that returns :class:`AmbientStatus`, wrap it in :class:`Mode`, and add
-it to the list returned by :func:`build_modes`.
+coroutine function that returns :class:`AmbientStatus`, wrap it in :class:`Mode`,
+and add it to the list returned by :func:`build_modes`.
 """
 
 from __future__ import annotations
@@ -42,13 +45,15 @@ import argparse
 import asyncio
 import logging
 import os
-import shutil
+import time
+from collections import deque
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Callable, Iterable, Optional
+from typing import Awaitable, Callable, Iterable, Optional
 
-import requests
-from gpiozero import Button, RGBLED, TonalBuzzer
+import httpx
+import numpy as np
+from gpiozero import Button, Device, RGBLED, TonalBuzzer
 from gpiozero.tones import Tone
 
 
@@ -57,7 +62,7 @@ class AmbientStatus:
     """Represents the state that should be shown on the physical hardware."""
 
     label: str
-    color: tuple[float, float, float]
+    color: tuple[int, int, int]  # 8-bit RGB, 0-255 per channel
     description: str
     tone: Optional[Tone] = None
 
@@ -67,8 +72,10 @@ class Mode:
     """A data feed that can provide ambient statuses on demand."""
 
     name: str
-    fetch: Callable[[], AmbientStatus]
+    fetch: Callable[[], Awaitable[AmbientStatus]]
     update_interval: float
+    # Cleanup awaited on the event loop when ``CoolerPi.run`` stops.
+    aclose: Optional[Callable[[], Awaitable[None]]] = None
 
 
 class CoolerPi:
@@ -92,8 +99,15 @@ class CoolerPi:
             raise IndexError("default_mode_index out of range")
 
         self._mode_index = default_mode_index
-        self._mode_change_event: Optional[asyncio.Event] = None
+        # Latest status per mode index, kept fresh by one poller task per mode.
+        self._status_cache: dict[int, AmbientStatus] = {}
+        # Set whenever the selected mode changes or gets a fresh status.
+        self._refresh_event: Optional[asyncio.Event] = None
         self._loop: Optional[asyncio.AbstractEventLoop] = None
+        # What the hardware is currently showing, so unchanged statuses are
+        # not pushed to the PWM channels or chimed again.
+        self._last_color: Optional[tuple[int, int, int]] = None
+        self._last_tone: Optional[Tone] = None
 
         self.button.when_pressed = self._on_button_pressed
 
@@ -102,54 +116,89 @@ class CoolerPi:
 
         self._mode_index = (self._mode_index + 1) % len(self.modes)
         logging.info("Switched to mode: %s", self.modes[self._mode_index].name)
-        if self._mode_change_event and self._loop:
-            self._loop.call_soon_threadsafe(self._mode_change_event.set)
+        # gpiozero calls this from its own thread; hand off to the event loop.
+        if self._loop:
+            self._loop.call_soon_threadsafe(self._on_mode_changed)
+
+    def _on_mode_changed(self) -> None:
+        """Redraw for the newly selected mode (runs on the event loop)."""
+
+        # Always chime once for the newly selected mode.
+        self._last_tone = None
+        self._refresh_event.set()
 
     async def run(self) -> None:
-        """Start the asynchronous main loop."""
+        """Start the asynchronous main loop.
+
+        Every mode is polled in the background on its own interval, so a
+        button press redraws straight from the cache instead of waiting on a
+        fresh fetch.
+        """
 
         logging.info("Starting CoolerPi with %d mode(s)", len(self.modes))
         self._loop = asyncio.get_running_loop()
-        self._mode_change_event = asyncio.Event()
+        self._refresh_event = asyncio.Event()
 
+        pollers = [
+            asyncio.create_task(self._poll_mode(index)) for index in range(len(self.modes))
+        ]
+        try:
+            while True:
+                await self._refresh_event.wait()
+                self._refresh_event.clear()
+                status = self._status_cache.get(self._mode_index)
+                if status is not None:
+                    await self._display_status(status)
+        finally:
+            for poller in pollers:
+                poller.cancel()
+            await asyncio.gather(*pollers, return_exceptions=True)
+            for mode in self.modes:
+                if mode.aclose is not None:
+                    await mode.aclose()
+
+    async def _poll_mode(self, index: int) -> None:
+        """Keep the cached status for ``self.modes[index]`` up to date."""
+
+        mode = self.modes[index]
         while True:
-            mode = self.modes[self._mode_index]
             try:
-                status = mode.fetch()
+                status = await mode.fetch()
             except Exception as exc:  # noqa: BLE001 - top-level resiliency
                 logging.exception("Failed to fetch status for mode %s", mode.name)
                 status = AmbientStatus(
                     label=f"{mode.name} error",
-                    color=(1.0, 0.0, 0.0),
+                    color=(255, 0, 0),
                     description=str(exc),
                     tone=Tone("A4"),
                 )
 
-            await self._display_status(status)
-
-            try:
-                await asyncio.wait_for(
-                    self._mode_change_event.wait(), timeout=mode.update_interval
-                )
-            except asyncio.TimeoutError:
-                pass
-            finally:
-                self._mode_change_event.clear()
+            self._status_cache[index] = status
+            if index == self._mode_index:
+                self._refresh_event.set()
+            await asyncio.sleep(mode.update_interval)
 
     async def _display_status(self, status: AmbientStatus) -> None:
         """Update the LED and buzzer to reflect the provided status."""
 
         logging.debug("Displaying status: %s", status)
-        self.led.color = status.color
+        if status.color != self._last_color:
+            red, green, blue = status.color
+            self.led.color = (red / 255, green / 255, blue / 255)
+            self._last_color = status.color
         logging.info("%s: %s", status.label, status.description)
 
-        if status.tone is not None:
+        # The buzzer is always stopped between statuses, so there is nothing
+        # to do unless a new tone should be played.
+        tone_changed = status.tone is not None and status.tone != self._last_tone
+        # Record the tone before the chime's sleep so a mode change that resets
+        # it meanwhile isn't overwritten.
+        self._last_tone = status.tone
+        if tone_changed:
             self.buzzer.play(status.tone)
             # Give the tone a short duration to avoid being annoying.
             await asyncio.sleep(0.6)
             self.buzzer.stop()
-        else:
-            self.buzzer.stop()
 
 
 class WeatherFetcher:
@@ -162,14 +211,28 @@ class WeatherFetcher:
         latitude: float,
         longitude: float,
         timezone_name: str = "auto",
-        session: Optional[requests.Session] = None,
+        client: Optional[httpx.AsyncClient] = None,
     ) -> None:
         self.latitude = latitude
         self.longitude = longitude
         self.timezone_name = timezone_name
-        self.session = session or requests.Session()
+        # Keep the HTTP/2 connection open between polls so each refresh skips
+        # the TCP and TLS handshakes; httpx drops idle connections after 5 s
+        # unless told otherwise.
+        self._owns_client = client is None
+        self.client = client or httpx.AsyncClient(
+            http2=True,
+            timeout=10,
+            limits=httpx.Limits(keepalive_expiry=900),
+        )
+
+    async def aclose(self) -> None:
+        """Close the HTTP client if this fetcher created it."""
 
-    def fetch(self) -> AmbientStatus:
+        if self._owns_client:
+            await self.client.aclose()
+
+    async def fetch(self) -> AmbientStatus:
         params = {
             "latitude": self.latitude,
             "longitude": self.longitude,
@@ -178,7 +241,7 @@ class WeatherFetcher:
             "timezone": self.timezone_name,
         }
 
-        response = self.session.get(self.API_URL, params=params, timeout=10)
+        response = await self.client.get(self.API_URL, params=params)
         response.raise_for_status()
         payload = response.json()
 
@@ -204,21 +267,17 @@ class WeatherFetcher:
         return AmbientStatus(label=label, color=color, description=description, tone=tone)
 
     @staticmethod
-    def _color_from_temperature(temperature_c: float, precip_probability: float) -> tuple[float, float, float]:
+    def _color_from_temperature(temperature_c: float, precip_probability: float) -> tuple[int, int, int]:
         """Map the temperature and precipitation chance to an RGB color."""
 
-        # Normalize temperature to a pleasant blue (cold) -> red (hot) gradient.
         clamped_temp = max(min(temperature_c, 35.0), -10.0)
-        normalized = (clamped_temp + 10.0) / 45.0
-        red = normalized
-        blue = 1.0 - normalized
-        green = 0.3 + 0.7 * (1.0 - abs(normalized - 0.5) * 2)
-
-        # Blend towards teal when there is a strong chance of precipitation.
-        precip_factor = min(max(precip_probability / 100.0, 0.0), 1.0)
-        red = red * (1.0 - precip_factor)
-        green = green * (1.0 - 0.3 * precip_factor) + 0.3 * precip_factor
-        blue = min(1.0, blue + 0.7 * precip_factor)
+        base = _TEMPERATURE_LUT[round((clamped_temp + 10.0) * 255 / 45.0)].astype(np.int32)
+
+        # Blend towards teal when there is a strong chance of precipitation,
+        # in integer percent so the whole blend stays in fixed point.
+        precip = round(min(max(precip_probability, 0.0), 100.0))
+        color = (base * (10000 - precip * _PRECIP_FADE) + precip * _PRECIP_TINT * 100) // 10000
+        red, green, blue = np.minimum(color, 255).tolist()
         return (red, green, blue)
 
     @staticmethod
@@ -232,9 +291,7 @@ class WeatherFetcher:
         min_speed, max_speed = 5.0, 60.0
         clamped = min(max(wind_speed_kmh, min_speed), max_speed)
         scale = (clamped - min_speed) / (max_speed - min_speed)
-        base_frequency = Tone("G4").frequency
-        target_frequency = base_frequency * (1.5 ** scale)
-        return Tone(target_frequency)
+        return _WIND_TONES[round(scale * (TONE_STEPS - 1))]
 
     @staticmethod
     def _build_description(
@@ -254,7 +311,10 @@ class WeatherFetcher:
         if precip_probability is not None:
             parts.append(f"Precipitation chance: {precip_probability:.0f}%")
 
-        description = WEATHER_CODE_DESCRIPTIONS.get(weather_code)
+        if 0 <= weather_code < len(_WEATHER_CODE_TABLE):
+            description = _WEATHER_CODE_TABLE[weather_code]
+        else:
+            description = WEATHER_CODE_DESCRIPTIONS.get(weather_code)
         if description:
             parts.append(description)
         return ", ".join(parts)
@@ -263,18 +323,39 @@ class WeatherFetcher:
 class SystemStatusFetcher:
     """Summarize the Pi's local system health."""
 
-    def __init__(self, root_path: Path = Path("/")) -> None:
-        self.root_path = root_path
+    THERMAL_ZONE = Path("/sys/class/thermal/thermal_zone0/temp")
 
-    def fetch(self) -> AmbientStatus:
+    def __init__(self, root_path: Path = Path("/"), disk_cache_seconds: float = 60.0) -> None:
+        self.root_path = root_path
+        # Disk usage changes slowly, so only re-stat the filesystem once a minute.
+        self.disk_cache_seconds = disk_cache_seconds
+        self._disk_ratio: Optional[float] = None
+        self._disk_checked_at = 0.0
+        # Keep the thermal zone open and re-read it in place on every poll
+        # instead of paying for an open/close pair each time.
+        try:
+            self._thermal_fd: Optional[int] = os.open(self.THERMAL_ZONE, os.O_RDONLY)
+        except FileNotFoundError:
+            self._thermal_fd = None
+
+    async def aclose(self) -> None:
+        """Release the thermal zone file descriptor."""
+
+        if self._thermal_fd is not None:
+            os.close(self._thermal_fd)
+            self._thermal_fd = None
+
+    async def fetch(self) -> AmbientStatus:
+        # The statvfs and sysfs reads block, so keep them off the event loop.
+        return await asyncio.to_thread(self._fetch_blocking)
+
+    def _fetch_blocking(self) -> AmbientStatus:
         load1, load5, _ = os.getloadavg()
         cpu_count = os.cpu_count() or 1
         load_ratio = load5 / cpu_count
 
-        disk_usage = shutil.disk_usage(self.root_path)
-        disk_ratio = disk_usage.used / disk_usage.total
-
-        temperature_c = _read_cpu_temperature()
+        disk_ratio = self._disk_usage_ratio()
+        temperature_c = self._read_cpu_temperature()
 
         severity = max(load_ratio, disk_ratio, _normalize_temperature(temperature_c))
         color = _color_from_severity(severity)
@@ -294,6 +375,26 @@ class SystemStatusFetcher:
             tone=tone,
         )
 
+    def _disk_usage_ratio(self) -> float:
+        now = time.monotonic()
+        if self._disk_ratio is None or now - self._disk_checked_at >= self.disk_cache_seconds:
+            stats = os.statvfs(self.root_path)
+            self._disk_ratio = (stats.f_blocks - stats.f_bfree) / stats.f_blocks
+            self._disk_checked_at = now
+        return self._disk_ratio
+
+    def _read_cpu_temperature(self) -> Optional[float]:
+        """Read the CPU temperature from the Raspberry Pi thermal zone."""
+
+        if self._thermal_fd is None:
+            return None
+        try:
+            # sysfs regenerates the value whenever it is read from offset 0.
+            raw = os.pread(self._thermal_fd, 16, 0)
+            return int(raw.strip()) / 1000.0
+        except (OSError, ValueError):
+            return None
+
 
 def _latest(sequence: Optional[Iterable[float]]) -> Optional[float]:
     if sequence is None:
@@ -302,27 +403,13 @@ def _latest(sequence: Optional[Iterable[float]]) -> Optional[float]:
         if hasattr(sequence, "__getitem__"):
             # Many sequences exposed by requests/JSON are already lists.
             return float(sequence[-1])  # type: ignore[index]
-        last_value = None
-        for last_value in sequence:
-            pass
-        if last_value is None:
-            return None
-        return float(last_value)
+        # deque drains the iterator in C and keeps only the final item.
+        tail = deque(sequence, maxlen=1)
+        return float(tail[0]) if tail else None
     except (IndexError, ValueError, TypeError):
         return None
 
 
-def _read_cpu_temperature() -> Optional[float]:
-    """Read the CPU temperature from the Raspberry Pi thermal zone."""
-
-    thermal_file = Path("/sys/class/thermal/thermal_zone0/temp")
-    try:
-        raw = thermal_file.read_text().strip()
-        return int(raw) / 1000.0
-    except (FileNotFoundError, ValueError):
-        return None
-
-
 def _normalize_temperature(temperature_c: Optional[float]) -> float:
     if temperature_c is None:
         return 0.0
@@ -330,21 +417,59 @@ def _normalize_temperature(temperature_c: Optional[float]) -> float:
     return min(max((temperature_c - 50.0) / 30.0, 0.0), 1.0)
 
 
-def _color_from_severity(severity: float) -> tuple[float, float, float]:
-    # Start at soothing green and move towards red as severity increases.
+def _color_from_severity(severity: float) -> tuple[int, int, int]:
     severity = min(max(severity, 0.0), 1.0)
-    red = severity
-    green = 1.0 - 0.4 * severity
-    blue = max(0.0, 1.0 - severity * 1.2)
+    red, green, blue = _SEVERITY_LUT[round(severity * 255)].tolist()
     return (red, green, blue)
 
 
 def _tone_from_severity(severity: float) -> Optional[Tone]:
     if severity < 0.2:
         return None
-    min_freq, max_freq = Tone("E4").frequency, Tone("C6").frequency
-    frequency = min_freq + (max_freq - min_freq) * min(max(severity, 0.0), 1.0)
-    return Tone(frequency)
+    return _SEVERITY_TONES[round(min(severity, 1.0) * (TONE_STEPS - 1))]
+
+
+def _build_temperature_lut() -> np.ndarray:
+    """Precompute the blue (cold) -> red (hot) gradient across -10..35°C."""
+
+    normalized = np.linspace(0.0, 1.0, 256)
+    lut = np.empty((256, 3))
+    lut[:, 0] = normalized
+    lut[:, 1] = 0.3 + 0.7 * (1.0 - np.abs(normalized - 0.5) * 2)
+    lut[:, 2] = 1.0 - normalized
+    return np.rint(lut * 255).astype(np.uint8)
+
+
+def _build_severity_lut() -> np.ndarray:
+    """Precompute the soothing green -> red ramp used for system severity."""
+
+    severity = np.linspace(0.0, 1.0, 256)
+    lut = np.empty((256, 3))
+    lut[:, 0] = severity
+    lut[:, 1] = 1.0 - 0.4 * severity
+    lut[:, 2] = np.maximum(0.0, 1.0 - severity * 1.2)
+    return np.rint(lut * 255).astype(np.uint8)
+
+
+# Color lookups index these 8-bit tables instead of redoing the math per fetch.
+_TEMPERATURE_LUT = _build_temperature_lut()
+_SEVERITY_LUT = _build_severity_lut()
+# At 100% rain chance: the share of each channel faded out (in percent) and
+# the teal tint blended in (8-bit).
+_PRECIP_FADE = np.array([100, 30, 0], dtype=np.int32)
+_PRECIP_TINT = np.array([0, 77, 179], dtype=np.int32)
+
+# Tones are likewise built once and picked by index.
+TONE_STEPS = 64
+# Severity climbs linearly from E4 to C6.
+_SEVERITY_TONES: tuple[Tone, ...] = tuple(
+    Tone(float(frequency))
+    for frequency in np.linspace(Tone("E4").frequency, Tone("C6").frequency, TONE_STEPS)
+)
+# Wind spans the fifth from G4 to D5.
+_WIND_TONES: tuple[Tone, ...] = tuple(
+    Tone(Tone("G4").frequency * 1.5 ** (i / (TONE_STEPS - 1))) for i in range(TONE_STEPS)
+)
 
 
 WEATHER_CODE_DESCRIPTIONS: dict[int, str] = {
@@ -379,6 +504,12 @@ WEATHER_CODE_DESCRIPTIONS: dict[int, str] = {
     99: "Thunderstorm with heavy hail",
 }
 
+# WMO codes are small integers, so lookups index a flat tuple; the dict above
+# stays as the readable source and covers the out-of-range "unknown" code.
+_WEATHER_CODE_TABLE: tuple[Optional[str], ...] = tuple(
+    WEATHER_CODE_DESCRIPTIONS.get(code) for code in range(100)
+)
+
 
 def build_modes(args: argparse.Namespace) -> list[Mode]:
     """Create the list of active modes based on CLI arguments."""
@@ -390,6 +521,7 @@ def build_modes(args: argparse.Namespace) -> list[Mode]:
             name="System health",
             fetch=system_fetcher.fetch,
             update_interval=args.system_interval,
+            aclose=system_fetcher.aclose,
         )
     )
 
@@ -404,6 +536,7 @@ def build_modes(args: argparse.Namespace) -> list[Mode]:
                 name="Weather",
                 fetch=weather_fetcher.fetch,
                 update_interval=args.weather_interval,
+                aclose=weather_fetcher.aclose,
             )
         )
     return modes
@@ -474,9 +607,27 @@ def parse_args() -> argparse.Namespace:
     return parser.parse_args()
 
 
+def select_pin_factory() -> None:
+    """Prefer lgpio, which waits on kernel edge events instead of polling.
+
+    An explicit ``GPIOZERO_PIN_FACTORY`` always wins; without lgpio gpiozero
+    keeps picking its usual default.
+    """
+
+    if os.environ.get("GPIOZERO_PIN_FACTORY"):
+        return
+    try:
+        from gpiozero.pins.lgpio import LGPIOFactory
+
+        Device.pin_factory = LGPIOFactory()
+    except Exception as exc:  # noqa: BLE001 - any failure means "use the default"
+        logging.warning("lgpio pin factory unavailable (%s); using gpiozero's default", exc)
+
+
 def create_hardware(args: argparse.Namespace) -> tuple[RGBLED, Button, TonalBuzzer]:
     """Instantiate the gpiozero devices."""
 
+    select_pin_factory()
     red, green, blue = args.led_pins
     led = RGBLED(red=red, green=green, blue=blue, pwm=True, active_high=False)
     button = Button(args.button_pin, pull_up=True, bounce_time=0.1)